@@ -36,16 +36,73 @@ _FONT = fonts.sans18
 # Precomputed for efficiency
 _LINEH = const(30) # int(_FONTH * 1.25)
 _MAXLINES = const(8) # floor(_HEIGHT / _LINEH) - 1 # the "-1" is the input line
+# The narrowest glyphs (i, j, l) are 5px + 1px spacing so at most
+# _WIDTH // 6 == 40 characters fit on a line, this leaves some slack
+_MAXCOLS = const(48)
+_MAXBUFFER = const(64) # lines kept once they have scrolled off the screen
 
 # The morse lookup table, represented as a flattened binary tree.
 # The head is the value of the node, the tail are the subtrees:
 # left half of the tail = the next symbol is a dot
 # right half of the tail = the next symbol is a line
-_CODE = " eish54v?3uf????2arl?????wp??j?1tndb6?x??kc??y??mgz7?q??o?8??90"
+# Stored as bytes so indexing it yields an int rather than a new string.
+_CODE = b" eish54v?3uf????2arl?????wp??j?1tndb6?x??kc??y??mgz7?q??o?8??90"
 # uppercase:
-#_CODE = " EISH54V?3UF????2ARL?????WP??J?1TNDB6?X??KC??Y??MGZ7?Q??O?8??90"
+#_CODE = b" EISH54V?3UF????2ARL?????WP??J?1TNDB6?X??KC??Y??MGZ7?Q??O?8??90"
 # letters only:
-#_CODE = " EISHVUF?ARL?WPJTNDBXKCYMGZQO??"
+#_CODE = b" EISHVUF?ARL?WPJTNDBXKCYMGZQO??"
+
+def _bisect(bits, n):
+    """Find the node of _CODE that a sequence of dots and lines leads to.
+
+    :param bits: The sequence, one bit per symbol (1 for a line) with the
+                 first symbol in the most significant bit
+    :param n:    Length of the sequence
+    :returns:    Index of the node in _CODE, or -1 if the sequence is too long
+    """
+    i = 0 # start of the subtree (current node)
+    l = len(_CODE) # length of the subtree
+
+    for k in range(n):
+        # first discard the head, which represent the previous guess
+        i += 1
+        l -= 1
+
+        # Check if we can no longer bisect while there are still dots/lines
+        if l <= 0: return -1
+
+        # Update the bounds to the appropriate subtree
+        # (left or right of the tail).
+        # The length will always be half:
+        l >>= 1
+        # The index will be either at the beginning of the tail,
+        # or at its half, in which case we subtract the current length,
+        # which is half of the old length.
+        # The bit is 1 for a line so this adds l without branching:
+        i += l * ((bits >> (n - 1 - k)) & 1)
+    return i
+
+# Walking the tree on every keypress is wasteful since _CODE never changes.
+# Instead every sequence of up to _DEPTH symbols is bisected once and the
+# result stored at (1 << length) | bits, so guessing a letter is a single
+# load. Longer sequences fall off the tree and are shown as "?".
+_DEPTH = const(5) # len(_CODE) == 2**(_DEPTH+1) - 1
+_TAB = bytearray(2 << _DEPTH)
+for _n in range(_DEPTH + 1):
+    for _bits in range(1 << _n):
+        _i = _bisect(_bits, _n)
+        _TAB[(1 << _n) | _bits] = _CODE[_i] if _i >= 0 else 0x3f # "?"
+del _n, _bits, _i, _bisect
+
+def _advance(c):
+    """Width of a character code, including the gap that follows it.
+
+    This must match how draw.wrap() measures text. "." is the way a space
+    is stored, so it is measured as a space.
+    """
+    if c == 0x2e:
+        c = 0x20
+    return _FONT.get_ch(chr(c))[2] + 1
 
 class MorseApp():
     NAME = 'Morse'
@@ -66,71 +123,135 @@ class MorseApp():
 
     def __init__(self):
         self.letter = ""
-        self.text = [""]
+        self._bits = 0 # self.letter, one bit per symbol, see _TAB
+        self.text = []
+        self.buffer = None  # allocated once a line scrolls off the screen
+        # The line being edited lives in a preallocated buffer so typing does
+        # not allocate a new string for every letter. Spaces are stored as
+        # "." (the way they are displayed), morse never produces a "." itself.
+        self._line = bytearray(_MAXCOLS)
+        self._len = 0
+        self._line_str = None  # self._line as a str, None when stale
+        self._line_px = 0  # width of self._line, as measured by draw.wrap()
 
     def foreground(self):
+        text = []
         try:
-            text = [t.strip() for t in wasp.system.get("morse") if t.strip() != ""]
-            if len(text) > _MAXLINES:
-                self.text = text[-_MAXLINES:]
-                self.buffer = text[:-_MAXLINES]
+            for t in wasp.system.get("morse"):
+                t = t.strip()
+                if t:
+                    text.append(t)
         except:
-            self.text = [""]
-            self.buffer = []
+            pass
+        self._set_line(text.pop() if text else "")
+        self.text = []
+        self.buffer = text if text else None
         self._draw()
         wasp.system.request_event(wasp.EventMask.TOUCH |
                                   wasp.EventMask.SWIPE_LEFTRIGHT |
                                   wasp.EventMask.SWIPE_UPDOWN)
 
     def background(self):
-        wasp.system.set("morse", self.buffer + self.text)
+        buffer = self.buffer if self.buffer else []
+        wasp.system.set("morse", buffer + self.text + [self._get_line()])
 
     def swipe(self, event):
         self.adjust_buffer()
-        if event[0] == wasp.EventType.LEFT:
+        direction = event[0]
+        if direction == wasp.EventType.LEFT:
             if self.letter == "":
-                if self.text[-1] == "" and len(self.text) > 1:
-                    self.text.pop(-1)  # remove last line
+                if self._len == 0 and len(self.text) > 0:
+                    self._set_line(self.text.pop())  # remove last line
                     self._draw()
                 else:
-                    self.text[-1] = self.text[-1][:-1]  # remove last character
+                    if self._len > 0:
+                        self._len -= 1  # remove last character
+                        self._line_str = None
+                        self._line_px -= _advance(self._line[self._len])
                     self._update()
             self.letter = ""
-        elif event[0] == wasp.EventType.RIGHT:
-            if self.text[-1].endswith(" "):
-                self.text.append("")   # add nothing but on a new line
+            self._bits = 0
+        elif direction == wasp.EventType.RIGHT:
+            if self._len > 0 and self._line[self._len - 1] == 0x2e:
+                self.text.append(self._get_line())  # add nothing but on a new line
+                self._len = 0
+                self._line_str = None
+                self._line_px = 0
                 self._draw()
             else:
                 self._add_letter(" ")  # add space
         else:
             if len(self.letter) < _MAXINPUT:
-                self.letter += "-" if event[0] == wasp.EventType.UP else "."
+                if direction == wasp.EventType.UP:
+                    self.letter += "-"
+                    self._bits = (self._bits << 1) | 1
+                else:
+                    self.letter += "."
+                    self._bits <<= 1
                 self.adjust_buffer()
                 self._update()
 
     def touch(self, event):
-        self._add_letter(self._lookup(self.letter))
+        self._add_letter(self._lookup())
+
+    def _set_line(self, s):
+        """Replace the line being edited."""
+        line = self._line
+        n = min(len(s), _MAXCOLS)
+        px = 0
+        for i in range(n):
+            c = ord(s[i])
+            px += _advance(c)
+            line[i] = 0x2e if c == 0x20 else c
+        self._len = n
+        self._line_str = None
+        self._line_px = px
+
+    def _get_line(self):
+        """Get the line being edited, with its spaces restored."""
+        return str(self._line[:self._len], 'ascii').replace(".", " ")
 
     def _add_letter(self, addition):
-        merged = self.text[-1] + addition
-        # Check if the new text overflows the screen and add a new line if that's the case
-        split = wasp.watch.drawable.wrap(merged, _WIDTH)
-        if len(split) > 2:
-            self.text.append(self.text[-1][split[1]:split[2]] + addition)
-            self.text[-2] = self.text[-2][split[0]:split[1]]
-            # Ideally a full refresh should be done only when we exceed
-            # _MAXLINES, but this should be fast enough
-            self._draw()
+        draw = wasp.watch.drawable
+        c = ord(addition)
+        px = self._line_px + _advance(c)
+        if px <= _WIDTH:
+            self._line[self._len] = 0x2e if c == 0x20 else c
+            self._len += 1
+            self._line_str = None
+            self._line_px = px
         else:
-            self.text[-1] = merged
+            # The new text overflows the screen, let draw.wrap() decide
+            # where to break it and move the remainder to a new line
+            merged = self._get_line() + addition
+            split = draw.wrap(merged, _WIDTH)
+            self.text.append(merged[split[0]:split[1]])
+            self._set_line(merged[split[1]:])
+            if len(self.text) >= _MAXLINES:
+                # Every line scrolls up. The display cannot be read back so
+                # there is no cheaper way to move them than a full refresh.
+                self._draw()
+            else:
+                # Only the line we just split needs redrawing, the new last
+                # line is drawn by _update()
+                y = _LINEH * (len(self.text) - 1)
+                draw.fill(None, 0, y, _WIDTH, _LINEH)
+                draw.string(self.text[-1].replace(" ", "."), 0, y)
         self.letter = ""
+        self._bits = 0
         self.adjust_buffer()
         self._update()
 
     def adjust_buffer(self):
-        while len(self.text) > _MAXLINES:
+        # self.text does not include the line being edited, hence the -1
+        while len(self.text) > _MAXLINES - 1:
+            if self.buffer is None:
+                self.buffer = []
+            # Forget the oldest lines to keep memory use bounded
+            while len(self.buffer) >= _MAXBUFFER:
+                self.buffer.pop(0)
             self.buffer.append(self.text.pop(0))
-        if len(self.text) < _MAXLINES and len(self.buffer) > 0:
+        while len(self.text) < _MAXLINES - 1 and self.buffer:
             self.text.insert(0, self.buffer.pop())
 
     def _draw(self):
@@ -147,28 +268,15 @@ class MorseApp():
         input line and last line of the text.
         The full text area is updated in _draw() instead."""
         draw = wasp.watch.drawable
-        draw.fill(None, x=0, y=_LINEH*(len(self.text)-1), w=_WIDTH, h=_LINEH)  # erase last line
-        draw.string("{} {}".format(self.letter, self._lookup(self.letter)), 0, _HEIGHT - _FONTH, width=_WIDTH, right=True)  # draw guess
-        draw.string(self.text[-1].replace(" ", "."), 0, _LINEH*(len(self.text)-1))  # draw last line
-
-    def _lookup(self, s):
-        i = 0 # start of the subtree (current node)
-        l = len(_CODE) # length of the subtree
-
-        for c in s:
-            # first discard the head, which represent the previous guess
-            i += 1
-            l -= 1
-
-            # Check if we can no longer bisect while there are still dots/lines
-            if l <= 0: return "?"
-
-            # Update the bounds to the appropriate subtree
-            # (left or right of the tail).
-            # The length will always be half:
-            l //= 2
-            # The index will be either at the beginning of the tail,
-            # or at its half, in which case we subtract the current length,
-            # which is half of the old length:
-            if c == "-": i += l
-        return _CODE[i]
+        draw.fill(None, x=0, y=_LINEH*len(self.text), w=_WIDTH, h=_LINEH)  # erase last line
+        draw.string("{} {}".format(self.letter, self._lookup()), 0, _HEIGHT - _FONTH, width=_WIDTH, right=True)  # draw guess
+        line = self._line_str
+        if line is None:
+            line = self._line_str = str(self._line[:self._len], 'ascii')
+        draw.string(line, 0, _LINEH*len(self.text))  # draw last line
+
+    def _lookup(self):
+        n = len(self.letter)
+        if n > _DEPTH:
+            return "?"
+        return chr(_TAB[(1 << n) | self._bits])
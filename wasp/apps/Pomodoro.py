@@ -17,7 +17,6 @@ more than 4 times.
 import wasp
 import fonts
 import widgets
-import math
 import random
 from micropython import const
 
@@ -45,11 +44,13 @@ _STOPPED = const(0)
 _RUNNING = const(1)
 _RINGING = const(2)
 _REPEAT_MAX = const(99)  # auto stop repeat after 99 runs
-_FIELDS = const(1234567890)
+_FIELDS = b'1234567890'
+_MAX_QUEUE = const(13)  # longest queue that fits on the screen
+_RED = const(0xf800)
 _MAX_VIB = const(15)  # max number of second the watch you vibrate
 
 # you can add your own presets here:
-_PRESETS = ['1,10', '10,1', '20,5']
+_PRESETS = ('1,10', '10,1', '20,5')
 _TIME_MODE = const(1)  # if 0: duration of vibration will be discounted
 # from timer. if 1: not discounted
 
@@ -68,14 +69,16 @@ class PomodoroApp():
         self.last_preset = _STOPPED
         self.last_run = -1  # to keep track of where in the queue we are
         self.state = _STOPPED
+        self._time_buf = bytearray(b'00:00')
+        self._buzz_left = 0  # vibrations left for the current alarm
 
         # reloading last value
         try:
             last_val = wasp.system.get("pomodoro")
             self.nb_vibrat_per_alarm = int(last_val[0])
-            self.queue = last_val[1]
+            self.queue = bytearray(last_val[1], 'ascii')
         except:
-            self.queue = _PRESETS[0]
+            self.queue = bytearray(_PRESETS[0], 'ascii')
             self.nb_vibrat_per_alarm = 10 # number of times to vibrate each time
         return True
 
@@ -100,27 +103,30 @@ class PomodoroApp():
 
     def tick(self, ticks):
         if self.state == _RINGING:
+            pulse = wasp.watch.vibrator.pulse
+            randint = random.randint
             if self.nb_vibrat_per_alarm <= 3:
-                wasp.watch.vibrator.pulse(duty=50, ms=650)
+                pulse(duty=50, ms=650)
             else:
                 if random.random() > 0.7:  # one very long vibration
-                    wasp.watch.vibrator.pulse(duty=random.randint(3, 60),
-                                              ms=900)
+                    pulse(duty=randint(3, 60), ms=900)
                 else:  # burst of vibration
+                    sleep = wasp.watch.time.sleep
                     max_dur = 900
                     done = 0
                     while done <= max_dur:
-                        new_vibr = random.randint(20, 200)
-                        new_sleep = random.randint(0, 300)
+                        new_vibr = randint(20, 200)
+                        new_sleep = randint(0, 300)
                         while done + new_vibr + new_sleep > max_dur * 1.1:
-                            new_vibr = random.randint(20, 200)
-                            new_sleep = random.randint(0, 300)
-                        wasp.watch.vibrator.pulse(duty=3, ms=new_vibr)
-                        wasp.watch.time.sleep(new_sleep * 0.001)
+                            new_vibr = randint(20, 200)
+                            new_sleep = randint(0, 300)
+                        pulse(duty=3, ms=new_vibr)
+                        sleep(new_sleep * 0.001)
                         done += new_vibr + new_sleep
             wasp.system.keep_awake()
             self.nb_vibrat_total += 1
-            if self.nb_vibrat_total % self.nb_vibrat_per_alarm == 0:
+            self._buzz_left -= 1
+            if self._buzz_left <= 0:
                 # vibrated self.nb_vibrat_per_alarm times so
                 # no more repeat needed
                 if self.nb_vibrat_total // self.nb_vibrat_per_alarm // len(self.squeue) < _REPEAT_MAX:
@@ -143,13 +149,10 @@ class PomodoroApp():
                 if self.nb_vibrat_per_alarm == 0:
                     self.nb_vibrat_per_alarm = _MAX_VIB
             else:
-                if event[0] == wasp.EventType.RIGHT:
-                    self.last_preset += 1
-                elif event[0] == wasp.EventType.LEFT:
-                    self.last_preset -= 1
-                self.last_preset %= len(_PRESETS)
-                self.queue = _PRESETS[self.last_preset]
-            draw.string(self.queue, 0, 35, right=True, width=240)
+                step = 1 if event[0] == wasp.EventType.RIGHT else -1
+                self.last_preset = (self.last_preset + step) % len(_PRESETS)
+                self.queue = bytearray(_PRESETS[self.last_preset], 'ascii')
+            draw.string(str(self.queue, 'ascii'), 0, 35, right=True, width=240)
             draw.string("V{}".format(self.nb_vibrat_per_alarm), 0, 35)
 
     def touch(self, event):
@@ -160,34 +163,33 @@ class PomodoroApp():
             if self.btn_stop.touch(event):
                 self._stop()
             elif self.btn_add.touch(event):
-                wasp.system.cancel_alarm(self.current_alarm, self._alert)
+                system = wasp.system
+                system.cancel_alarm(self.current_alarm, self._alert)
                 self.current_alarm += 60
-                wasp.system.set_alarm(self.current_alarm, self._alert)
+                system.set_alarm(self.current_alarm, self._alert)
                 wasp.watch.vibrator.pulse(duty=25, ms=50)
                 self._update()
         elif self.state == _STOPPED:
             if self.btn_del.touch(event):
-                if len(self.queue) > 1:
-                    self.queue = self.queue[:-1]
-                else:
-                    self.queue = ""
+                del self.queue[-1:]
             elif self.btn_start.touch(event):
-                if self.queue != "" and not self.queue.endswith(","):
-                    self.squeue = [int(x) for x in self.queue.split(",")]
+                if self.queue and self.queue[-1] != 0x2c:  # ","
+                    self.squeue = [int(x) for x in
+                                   str(self.queue, 'ascii').split(",")]
                     self._start(first_run=True)
                     return
-            elif len(self.queue) < 13:
-                if self.btn_add.touch(event):
-                    if len(self.queue) >= 1 and self.queue[-1] != ",":
-                        self.queue += ","
+            elif len(self.queue) < _MAX_QUEUE:
+                if self.btn_then.touch(event):
+                    if self.queue and self.queue[-1] != 0x2c:  # ","
+                        self.queue.append(0x2c)
                 else:
                     for i, b in enumerate(self.btns):
                         if b.touch(event):
-                            self.queue += str((i + 1) % 10)
+                            self.queue.append(_FIELDS[i])
                             break
             draw = wasp.watch.drawable
             draw.set_font(fonts.sans24)
-            draw.string(self.queue, 0, 35, right=True, width=240)
+            draw.string(str(self.queue, 'ascii'), 0, 35, right=True, width=240)
             draw.string("V{}".format(self.nb_vibrat_per_alarm), 0, 35)
 
     def _start(self, first_run=False):
@@ -210,10 +212,12 @@ class PomodoroApp():
             self.current_alarm = now + max(m * 60, 1)
         else:
             self.current_alarm = now + max(m * 60 - self.nb_vibrat_per_alarm, 1)
-        wasp.system.set_alarm(self.current_alarm, self._alert)
+        system = wasp.system
+        system.set_alarm(self.current_alarm, self._alert)
         self._draw()
-        if hasattr(wasp.system, "set") and callable(wasp.system.set):
-            wasp.system.set("pomodoro", [self.nb_vibrat_per_alarm, self.queue])
+        if hasattr(system, "set") and callable(system.set):
+            system.set("pomodoro", [self.nb_vibrat_per_alarm,
+                                    str(self.queue, 'ascii')])
 
     def _stop(self):
         self.state = _STOPPED
@@ -250,14 +254,13 @@ class PomodoroApp():
             draw.set_font(fonts.sans18)
         elif self.state == _STOPPED:
             self.btns = []
-            fields = str(_FIELDS)
             for y in range(2):
                 for x in range(5):
                     btn = widgets.Button(x=x*48,
                                          y=y*65+60,
                                          w=49,
                                          h=59,
-                                         label=fields[x + 5*y])
+                                         label=chr(_FIELDS[x + 5*y]))
                     btn.draw()
                     self.btns.append(btn)
             self.btn_del = widgets.Button(x=0,
@@ -266,22 +269,22 @@ class PomodoroApp():
                                           h=50,
                                           label="Del.")
             self.btn_del.draw()
-            self.btn_add = widgets.Button(x=80,
-                                          y=190,
-                                          w=76,
-                                          h=50,
-                                          label="Then")
-            self.btn_add.draw()
+            self.btn_then = widgets.Button(x=80,
+                                           y=190,
+                                           w=76,
+                                           h=50,
+                                           label="Then")
+            self.btn_then.draw()
             self.btn_start = widgets.Button(x=160,
                                             y=190,
                                             w=80,
                                             h=50,
                                             label="Go")
             self.btn_start.update(txt=0, frame=wasp.system.theme('mid'),
-                                  bg=0xf800)
+                                  bg=_RED)
             draw.reset()
             draw.set_font(fonts.sans24)
-            draw.string(self.queue, 0, 35, right=True, width=240)
+            draw.string(str(self.queue, 'ascii'), 0, 35, right=True, width=240)
             draw.string("V{}".format(self.nb_vibrat_per_alarm), 0, 35)
         sbar = wasp.system.bar
         sbar.clock = True
@@ -292,20 +295,30 @@ class PomodoroApp():
         draw = wasp.watch.drawable
         if self.state == _RUNNING:
             now = wasp.watch.rtc.time()
-            s = max(self.current_alarm - now, 0)
-            m = math.floor(s // 60)
-            s = math.floor(s) % 60
-            if len(str(m)) > 5:
-                prefix = "+"
-                m = int(str(m)[-4:])
+            s = int(self.current_alarm - now)
+            if s < 0:
+                s = 0
+            m, s = divmod(s, 60)
+            if m < 100:
+                buf = self._time_buf
+                buf[0] = 0x30 + m // 10
+                buf[1] = 0x30 + m % 10
+                buf[3] = 0x30 + s // 10
+                buf[4] = 0x30 + s % 10
+                t = str(buf, 'ascii')
             else:
-                prefix = ""
+                if m > 99999:
+                    prefix = "+"
+                    m %= 10000
+                else:
+                    prefix = ""
+                t = "{}{:02d}:{:02d}".format(prefix, m, s)
             draw.set_font(fonts.sans28)
-            draw.string("{}{:02d}:{:02d}".format(prefix, m, s), 90, 106,
-                        width=60)
+            draw.string(t, 90, 106, width=60)
 
     def _alert(self):
         self.state = _RINGING
+        self._buzz_left = self.nb_vibrat_per_alarm
         wasp.system.wake()
         wasp.system.switch(self)
         self._draw()
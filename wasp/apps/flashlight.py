@@ -12,6 +12,24 @@ Shows a bright screen that you can tap to change brightness or switch to redligh
 
 import wasp
 import icons
+from micropython import const
+
+_TICK_STEP = const(3)       # seconds between ticks
+_SLEEP_AFTER = const(180)   # seconds before going back to sleep
+_NCOLORS = const(6)         # length of the tap cycle, see touch()
+_RED = const(0xf800)
+_WHITE = const(0xffff)
+
+# (brightness, colour) for each step of the tap cycle. The screen is only
+# repainted when the colour changes.
+_TOUCH_TABLE = (
+    (1, None),
+    (3, _RED),
+    (2, None),
+    (1, None),
+    (3, _WHITE),
+    (2, None),
+)
 
 
 class TorchApp(object):
@@ -22,13 +40,13 @@ class TorchApp(object):
     def foreground(self):
         """Activate the application."""
         self._elapsed = 0
-        wasp.system.request_tick(3000)
+        wasp.system.request_tick(_TICK_STEP * 1000)
         wasp.system.request_event(wasp.EventMask.TOUCH)
 
         self._brightness = wasp.system.brightness
         wasp.system.brightness = 3
         self._ntouch = 1
-        wasp.watch.drawable.fill(0xf800)  # red
+        wasp.watch.drawable.fill(_RED)
 
     def background(self):
         """De-activate the application (without losing original state)."""
@@ -36,16 +54,13 @@ class TorchApp(object):
 
     def tick(self, ticks):
         wasp.system.keep_awake()
-        self._elapsed += 3
-        if self._elapsed >= 180:
+        self._elapsed += _TICK_STEP
+        if self._elapsed >= _SLEEP_AFTER:
             wasp.system.sleep()
 
     def touch(self, event):
-        self._ntouch += 1
-        self._ntouch %= 6
-        wasp.system.brightness = (-self._ntouch) % 3 + 1
-        if (-self._ntouch + 1) % 3 == 0:
-            if -self._ntouch % 6 < 3:
-                wasp.watch.drawable.fill(0xffff)  # white
-            else:
-                wasp.watch.drawable.fill(0xf800)  # red
+        self._ntouch = (self._ntouch + 1) % _NCOLORS
+        (brightness, color) = _TOUCH_TABLE[self._ntouch]
+        wasp.system.brightness = brightness
+        if color is not None:
+            wasp.watch.drawable.fill(color)
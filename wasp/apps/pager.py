@@ -16,6 +16,9 @@ import fonts
 import io
 import sys
 
+# Reused by every CrashApp so the traceback buffer is only grown once
+_crash_buf = io.StringIO()
+
 class PagerApp():
     """Show a long text message in a pager."""
     NAME = 'Pager'
@@ -32,47 +35,51 @@ class PagerApp():
 
     def background(self):
         """De-activate the application."""
-        self._chunks = None
+        self._lines = None
         self._numpages = None
 
     def swipe(self, event):
         """Swipe to page up/down."""
+        page = self._page
         if event[0] == wasp.EventType.UP:
-            if self._page >= self._numpages:
+            if page >= self._numpages:
                 wasp.system.navigate(wasp.EventType.BACK)
                 return
-            self._page += 1
+            self._page = page + 1
         else:
-            if self._page <= 0:
+            if page <= 0:
                 wasp.watch.vibrator.pulse()
                 return
-            self._page -= 1
+            self._page = page - 1
         self._draw()
 
     def _redraw(self):
         """Redraw from scratch (jump to the first page)"""
         self._page = 0
-        self._chunks = wasp.watch.drawable.wrap(self._msg, 240)
-        self._numpages = (len(self._chunks) - 2) // 9
+        msg = self._msg
+        chunks = wasp.watch.drawable.wrap(msg, 240)
+        lines = [msg[chunks[i]:chunks[i+1]].rstrip()
+                 for i in range(len(chunks)-1)]
+        self._lines = lines
+        self._numpages = (len(lines) - 1) // 9
         self._draw()
 
     def _draw(self):
         """Draw a page from scratch."""
         mute = wasp.watch.display.mute
         draw = wasp.watch.drawable
+        string = draw.string
 
         mute(True)
         draw.set_color(0xffff)
         draw.fill()
 
         page = self._page
-        i = page * 9
-        j = i + 11
-        chunks = self._chunks[i:j]
+        lines = self._lines
+        first = page * 9
         draw.set_font(fonts.sans18)
-        for i in range(len(chunks)-1):
-            sub = self._msg[chunks[i]:chunks[i+1]].rstrip()
-            draw.string(sub, 0, 24*i)
+        for i in range(min(10, len(lines) - first)):
+            string(lines[first + i], 0, 24*i)
         draw.reset()
 
         scroll = self._scroll
@@ -94,11 +101,10 @@ class NotificationApp(PagerApp):
         note = notes.pop(next(iter(notes)))
         title = note['title'] if 'title' in note else 'Untitled'
         body = note['body'] if 'body' in note else ''
-        rest = "/".join(["{}:{}".format(k, v)
-                         for k, v in note.items()
-                         if k not in ["title", "body"]])
-        if rest != "":
-            body += "\n({})".format(rest[:-1])
+        rest = "/".join("%s:%s" % kv for kv in note.items()
+                        if kv[0] not in ("title", "body"))
+        if rest:
+            body += "\n(%s)" % rest
         self._msg = '{}:\n{}'.format(title, body)
 
         wasp.system.request_event(wasp.EventMask.TOUCH)
@@ -145,10 +151,10 @@ class CrashApp():
         but we need to capture the exception info before we leave
         the except block.
         """
-        msg = io.StringIO()
-        sys.print_exception(exc, msg)
-        self._msg = msg.getvalue()
-        msg.close()
+        buf = _crash_buf
+        buf.seek(0)
+        sys.print_exception(exc, buf)
+        self._msg = buf.getvalue()[:buf.tell()]
 
     def foreground(self):
         """Indicate the system has crashed by drawing a couple of bomb icons.
@@ -23,6 +23,28 @@ import wasp
 import fonts
 import icons
 
+from micropython import const
+
+# Position of each setting in _LABELS and in the handler tuples
+_BRI = const(0)
+_BAT = const(1)
+_NFY = const(2)
+_TIME = const(3)
+_DATE = const(4)
+_UNITS = const(5)
+_HRM = const(6)
+_NSETTINGS = const(7)
+
+_LABELS = ('Brightness', 'Battery', 'Notification Level', 'Time', 'Date',
+           'Units', 'HRM freq')
+
+# Rows (y, height) below the title that each setting draws into. Sliders
+# and buttons start at y=90, the spinners occupy y=60 to 180, the date legend
+# is drawn at y=180 and the value label is drawn in sans24 at y=150 (with
+# two rows of slack below it).
+_EXTENTS = ((90, 86), (90, 86), (90, 86), (60, 120), (60, 146), (90, 86),
+            (40, 136))
+
 class SettingsApp():
     """Settings application."""
     NAME = 'Settings'
@@ -43,12 +65,33 @@ class SettingsApp():
         self._mm = wasp.widgets.Spinner(90, 60, 1, 12, 1)
         self._yy = wasp.widgets.Spinner(160, 60, 20, 60, 2)
         self._units = ['Metric', 'Imperial']
+        self._units_idx = self._units.index(wasp.system.units)
         self._units_toggle = wasp.widgets.Button(32, 90, 176, 48, "Change")
         self._batt = ['Percent', 'mV', 'Icon']
+        self._batt_idx = self._batt.index(wasp.system.battery_unit)
         self._battery_toggle = wasp.widgets.Button(32, 90, 176, 48, "Change")
-        self._settings = ['Brightness', 'Battery', 'Notification Level', 'Time', 'Date', 'Units', "HRM freq"]
+        self._settings = _LABELS
         self._sett_index = 0
-        self._current_setting = self._settings[0]
+        system = wasp.system
+        self._last_saved = {
+            "brightness": system.brightness,
+            "notify_level": system.notify_level,
+            "units": system.units,
+            "battery_unit": system.battery_unit,
+            "hrm_freq": system.hrm_freq,
+        }
+        self._last_label = None
+        self._current_setting = _BRI
+        # Indexed by _BRI, _BAT, _NFY, _TIME, _DATE, _UNITS and _HRM
+        self._touch_handlers = (self._touch_bri, self._touch_batt,
+                self._touch_nfy, self._touch_time, self._touch_date,
+                self._touch_units, self._touch_hrm)
+        self._draw_handlers = (self._draw_bri, self._draw_batt,
+                self._draw_nfy, self._draw_time, self._draw_date,
+                self._draw_units, None)
+        self._update_handlers = (self._update_bri, self._update_batt,
+                self._update_nfy, None, None,
+                self._update_units, self._update_hrm)
         return True
 
     def foreground(self):
@@ -58,44 +101,63 @@ class SettingsApp():
         wasp.system.request_event(wasp.EventMask.TOUCH | wasp.EventMask.SWIPE_UPDOWN)
 
     def touch(self, event):
-        if self._current_setting == 'Brightness':
-            self._bri_slider.touch(event)
-            wasp.system.brightness = self._bri_slider.value
-            wasp.system.set("brightness", wasp.system.brightness)
-        elif self._current_setting == 'Notification Level':
-            self._nfy_slider.touch(event)
-            wasp.system.notify_level = self._nfy_slider.value + 1
-            wasp.system.set("notify_level", wasp.system.notify_level)
-        elif self._current_setting == 'Time':
-            if self._HH.touch(event) or self._MM.touch(event):
-                now = list(wasp.watch.rtc.get_localtime())
-                now[3] = self._HH.value
-                now[4] = self._MM.value
-                wasp.watch.rtc.set_localtime(now)
-        elif self._current_setting == 'Date':
-            if self._yy.touch(event) or self._mm.touch(event) \
-                    or self._dd.touch(event):
-                now = list(wasp.watch.rtc.get_localtime())
-                now[0] = self._yy.value + 2000
-                now[1] = self._mm.value
-                now[2] = self._dd.value
-                wasp.watch.rtc.set_localtime(now)
-        elif self._current_setting == 'Units':
-            if self._units_toggle.touch(event):
-                wasp.system.units = self._units[(self._units.index(wasp.system.units) + 1) % len(self._units)]
-            wasp.system.set("units", wasp.system.units)
-        elif self._current_setting == 'Battery':
-            if self._battery_toggle.touch(event):
-                wasp.system.battery_unit = self._batt[(self._batt.index(wasp.system.battery_unit) + 1) % len(self._batt)]
-            wasp.system.set("battery_unit", wasp.system.battery_unit)
-        elif self._current_setting == "HRM freq":
-            if self._hrm_slider.touch(event):
-                wasp.system.hrm_freq = self._hrm_freq_values[self._hrm_slider.value]
-                if wasp.system.hrm_freq != 0:
-                    wasp.system.set_alarm(wasp.watch.rtc.time() + 60, wasp.system._perdiodic_heart_rate)
-            wasp.system.set("hrm_freq", wasp.system.hrm_freq)
+        self._touch_handlers[self._current_setting](event)
         self._update()
 
+    def _touch_bri(self, event):
+        self._bri_slider.touch(event)
+        wasp.system.brightness = self._bri_slider.value
+        self._save("brightness", wasp.system.brightness)
+
+    def _touch_nfy(self, event):
+        self._nfy_slider.touch(event)
+        wasp.system.notify_level = self._nfy_slider.value + 1
+        self._save("notify_level", wasp.system.notify_level)
+
+    def _touch_time(self, event):
+        if self._HH.touch(event) or self._MM.touch(event):
+            now = list(wasp.watch.rtc.get_localtime())
+            now[3] = self._HH.value
+            now[4] = self._MM.value
+            wasp.watch.rtc.set_localtime(now)
+
+    def _touch_date(self, event):
+        if self._yy.touch(event) or self._mm.touch(event) \
+                or self._dd.touch(event):
+            now = list(wasp.watch.rtc.get_localtime())
+            now[0] = self._yy.value + 2000
+            now[1] = self._mm.value
+            now[2] = self._dd.value
+            wasp.watch.rtc.set_localtime(now)
+
+    def _touch_units(self, event):
+        if self._units_toggle.touch(event):
+            self._units_idx = (self._units_idx + 1) % len(self._units)
+            wasp.system.units = self._units[self._units_idx]
+        self._save("units", wasp.system.units)
+
+    def _touch_batt(self, event):
+        if self._battery_toggle.touch(event):
+            self._batt_idx = (self._batt_idx + 1) % len(self._batt)
+            wasp.system.battery_unit = self._batt[self._batt_idx]
+        self._save("battery_unit", wasp.system.battery_unit)
+
+    def _touch_hrm(self, event):
+        if self._hrm_slider.touch(event):
+            freq = self._hrm_freq_values[self._hrm_slider.value]
+            wasp.system.hrm_freq = freq
+            if freq != 0:
+                wasp.system.arm_heart_rate()
+        self._save("hrm_freq", wasp.system.hrm_freq)
+
+    def _save(self, key, value):
+        """Persist a setting unless it is unchanged since it was loaded or
+        last saved."""
+        last_saved = self._last_saved
+        if last_saved.get(key) != value:
+            wasp.system.set(key, value)
+            last_saved[key] = value
+
     def swipe(self, event):
         """Handle NEXT events by augmenting the default processing by resetting
         the count if we are not currently timing something.
@@ -104,82 +166,120 @@ class SettingsApp():
         """
         if event[0] == wasp.EventType.UP:
             self._sett_index += 1
-            self._draw()
+            self._draw(self._current_setting)
         elif event[0] == wasp.EventType.DOWN:
             self._sett_index -= 1
-            self._draw()
+            self._draw(self._current_setting)
 
-    def _draw(self):
-        """Redraw the display from scratch."""
+    def _draw(self, previous=None):
+        """Redraw the display.
+
+        If the previous setting is known then only the rows it drew into
+        are cleared, otherwise the display is redrawn from scratch. The
+        title is always overwritten in full and the scroll indicator never
+        changes.
+        """
         draw = wasp.watch.drawable
         mute = wasp.watch.display.mute
-        self._current_setting = self._settings[self._sett_index % len(self._settings)]
+        cs = self._sett_index % _NSETTINGS
+        self._current_setting = cs
         mute(True)
-        draw.fill()
+        if previous is None:
+            draw.fill()
+        else:
+            y, h = _EXTENTS[previous]
+            draw.fill(0, 0, y, 240, h)
         draw.set_color(wasp.system.theme('bright'))
         draw.set_font(fonts.sans24)
-        draw.string(self._current_setting, 0, 6, width=240)
-        if self._current_setting == 'Brightness':
-            self._bri_slider.value = wasp.system.brightness
-        elif self._current_setting == 'Notification Level':
-            self._nfy_slider.value = wasp.system.notify_level - 1
-        elif self._current_setting == 'Time':
-            now = wasp.watch.rtc.get_localtime()
-            self._HH.value = now[3]
-            self._MM.value = now[4]
-            draw.set_font(fonts.sans28)
-            draw.string(':', 110, 120-14, width=20)
-            self._HH.draw()
-            self._MM.draw()
-        elif self._current_setting == 'Date':
-            now = wasp.watch.rtc.get_localtime()
-            self._yy.value = now[0] - 2000
-            self._mm.value = now[1]
-            self._dd.value = now[2]
-            self._yy.draw()
-            self._mm.draw()
-            self._dd.draw()
-            draw.set_font(fonts.sans24)
-            draw.string('DD    MM    YY',0,180, width=240)
-        elif self._current_setting == 'Units':
-            self._units_toggle.draw()
-        elif self._current_setting == 'Battery':
-            self._battery_toggle.draw()
+        draw.string(self._settings[cs], 0, 6, width=240)
+        handler = self._draw_handlers[cs]
+        if handler:
+            handler()
         self._scroll_indicator.draw()
+        self._last_label = None
         self._update()
         mute(False)
 
+    def _draw_bri(self):
+        self._bri_slider.value = wasp.system.brightness
+
+    def _draw_nfy(self):
+        self._nfy_slider.value = wasp.system.notify_level - 1
+
+    def _draw_time(self):
+        draw = wasp.watch.drawable
+        now = wasp.watch.rtc.get_localtime()
+        self._HH.value = now[3]
+        self._MM.value = now[4]
+        draw.set_font(fonts.sans28)
+        draw.string(':', 110, 120-14, width=20)
+        self._HH.draw()
+        self._MM.draw()
+
+    def _draw_date(self):
+        draw = wasp.watch.drawable
+        now = wasp.watch.rtc.get_localtime()
+        self._yy.value = now[0] - 2000
+        self._mm.value = now[1]
+        self._dd.value = now[2]
+        self._yy.draw()
+        self._mm.draw()
+        self._dd.draw()
+        draw.set_font(fonts.sans24)
+        draw.string('DD    MM    YY',0,180, width=240)
+
+    def _draw_units(self):
+        self._units_toggle.draw()
+
+    def _draw_batt(self):
+        self._battery_toggle.draw()
+
     def _update(self):
+        wasp.watch.drawable.set_color(wasp.system.theme('bright'))
+        handler = self._update_handlers[self._current_setting]
+        if handler:
+            handler()
+
+    def _update_bri(self):
+        brightness = wasp.system.brightness
+        if brightness == 3:
+            say = "High"
+        elif brightness == 2:
+            say = "Mid"
+        elif brightness == 1:
+            say = "Low"
+        else:  # == 0
+            say = "Very Low"
+        self._bri_slider.update()
+        self._label(say)
+
+    def _update_hrm(self):
         draw = wasp.watch.drawable
-        draw.set_color(wasp.system.theme('bright'))
-        if self._current_setting == 'Brightness':
-            if wasp.system.brightness == 3:
-                say = "High"
-            elif wasp.system.brightness == 2:
-                say = "Mid"
-            elif wasp.system.brightness == 1:
-                say = "Low"
-            else:  # == 0
-                say = "Very Low"
-            self._bri_slider.update()
-            draw.string(say, 0, 150, width=240)
-        elif self._current_setting == "HRM freq":
-            self._hrm_slider.draw()
-            draw.string("In minutes", 0, 40, 240)
-            val = str(self._hrm_freq_values[self._hrm_slider.value])
-            if val == "0":
-                val = "OFF"
-            draw.string(val, 0, 150, 240)
-        elif self._current_setting == 'Notification Level':
-            if wasp.system.notify_level == 3:
-                say = "High"
-            elif wasp.system.notify_level == 2:
-                say = "Mid"
-            else:
-                say = "Silent"
-            self._nfy_slider.update()
-            draw.string(say, 0, 150, width=240)
-        elif self._current_setting == 'Units':
-            draw.string(wasp.system.units, 0, 150, width=240)
-        elif self._current_setting == 'Battery':
-            draw.string(str(wasp.system.battery_unit), 0, 150, width=240)
+        self._hrm_slider.draw()
+        draw.string("In minutes", 0, 40, 240)
+        val = str(self._hrm_freq_values[self._hrm_slider.value])
+        if val == "0":
+            val = "OFF"
+        self._label(val)
+
+    def _update_nfy(self):
+        if wasp.system.notify_level == 3:
+            say = "High"
+        elif wasp.system.notify_level == 2:
+            say = "Mid"
+        else:
+            say = "Silent"
+        self._nfy_slider.update()
+        self._label(say)
+
+    def _update_units(self):
+        self._label(wasp.system.units)
+
+    def _update_batt(self):
+        self._label(str(wasp.system.battery_unit))
+
+    def _label(self, say):
+        """Draw the value label unless it is already on the screen."""
+        if say != self._last_label:
+            wasp.watch.drawable.string(say, 0, 150, width=240)
+            self._last_label = say
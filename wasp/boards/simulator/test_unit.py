@@ -70,3 +70,37 @@ def test_font_width(draw):
 ))
 def test_wrap(draw, input, expected):
     assert draw.wrap(input, 240) == expected
+
+def test_get_many(tmp_path, monkeypatch):
+    import wasp
+    system = wasp.system
+    monkeypatch.chdir(tmp_path)
+
+    # No settings folder at all
+    assert system.get_many(('units', 'hrm_freq'), ('Metric', 0)) == \
+            ('Metric', 0)
+
+    # A stored value is returned as a string, a missing one uses its default
+    system.set('hrm_freq', 15)
+    assert system.get_many(('units', 'hrm_freq'), ('Metric', 0)) == \
+            ('Metric', '15')
+
+    # A stored None falls back to the default as well
+    system.set('units', None)
+    assert system.get_many(('units', 'hrm_freq'), ('Metric', 0)) == \
+            ('Metric', '15')
+
+def test_filter_notifications(monkeypatch):
+    import wasp
+    import gadgetbridge
+    monkeypatch.setattr(wasp.system, '_notif_filter', ['signal', 'sms'],
+                        raising=False)
+    flt = gadgetbridge.filter_notifications
+
+    # Filter words match any value, ignoring case
+    assert flt({'src': 'Signal', 'title': 'Bob', 'body': 'Hi'})
+    assert flt({'id': 3, 'src': 'Messages', 'body': 'New SMS'})
+    assert not flt({'src': 'K-9 Mail', 'title': 'Bob', 'body': 'Hi'})
+
+    # Keys are not matched and a word cannot straddle two values
+    assert not flt({'signal': 'x', 'src': 'sig', 'body': 'nal'})
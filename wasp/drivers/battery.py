@@ -9,6 +9,25 @@ from machine import Pin, ADC
 import array
 
 
+@micropython.viper
+def _mv(raw: int) -> int:
+    """Convert a raw ADC reading into millivolts.
+
+    Assumes a 50/50 voltage divider and a 3.3v power supply.
+    """
+    return (2 * 3300 * raw) // 65535
+
+@micropython.viper
+def _level(mv: int) -> int:
+    """Map a voltage onto 0-100%, with 3.5v as 0% and 4.2v as 100%."""
+    level = (mv - 3500) // 7  # 0.7V is 4.2-3.5V
+    if level < 0:
+        return 0
+    if level > 100:
+        return 100
+    return level
+
+
 class Battery(object):
     """Generic lithium ion battery driver.
 
@@ -28,7 +47,8 @@ class Battery(object):
         self._battery = ADC(battery)
         self._charging = charging
         self._power = power
-        self._cache = array.array("I")
+        self._cache = array.array("H", (0xffff, 0xffff, 0xffff))
+        self._cache_i = 0
 
     @micropython.native
     def charging(self):
@@ -53,30 +73,28 @@ class Battery(object):
 
         Assumes a 50/50 voltage divider and a 3.3v power supply
 
-        The last values is kept in a cache and only the minium cached value is
-        shown to the user, this is to avoid the battery level
+        The last three values are kept in a ring buffer and only the minimum
+        cached value is shown to the user, this is to avoid the battery level
         going up and down because of the lack of precision of the mv.
         Note that this will underestimate battery level.
 
         :returns: Battery voltage, in millivolts.
         """
-        raw = self._battery.read_u16()
-        mv = (2 * 3300 * raw) // 65535
+        mv = _mv(self._battery.read_u16())
         cache = self._cache
 
         if self._charging.value():  # if charging, reset cache
-            if len(cache):
-                cache = array.array("I")
-            return mv
-        if len(cache) < 2:
-            cache.append(mv)
+            cache[0] = cache[1] = cache[2] = 0xffff
             return mv
-        if len(cache) > 2:  # should not happen
-            cache = cache[-2:]
-        if mv != cache[0] and mv != cache[1]:
-            cache[0] = cache[1]
-            cache[1] = mv
-        return sum(cache) / 2
+
+        i = self._cache_i
+        cache[i] = mv
+        self._cache_i = 0 if i >= 2 else i + 1
+
+        a = cache[0]
+        b = cache[1]
+        c = cache[2]
+        return a if a < b and a < c else (b if b < c else c)
 
     def level(self):
         """Estimate the battery level.
@@ -89,6 +107,4 @@ class Battery(object):
 
         :returns: Estimate battery level in percent.
         """
-        mv = self.voltage_mv()
-        level = int((mv - 3500) / (700) * 100)  # 0.7V is 4.2-3.5V
-        return min(100, max(0, level))
+        return _level(self.voltage_mv())
@@ -21,6 +21,7 @@ Currently implemented messages are:
 import io
 import json
 import sys
+import time
 import wasp
 
 # JSON compatibility
@@ -42,15 +43,12 @@ def _error(msg):
 def filter_notifications(msg):
     """
     only display notifications that contain one of the element of
-    wasp._notif_filter
+    wasp._notif_filter, the filter words must already be lowercase
     """
     if not hasattr(wasp.system, "_notif_filter"):
         return True
-    for check in wasp.system._notif_filter:
-        for k, v in msg.items():
-            if check.lower() in str(k).lower() or check.lower() in str(v).lower():
-                return True
-    return False
+    hay = "\n".join(str(v) for v in msg.values()).lower()
+    return any(check in hay for check in wasp.system._notif_filter)
 
 
 def vibration_timeout():
@@ -63,59 +61,87 @@ def vibration_timeout():
         wasp.watch.vibrator.pin(True)
 
 
+def _find(cmd):
+    wasp.system.set_alarm(
+            wasp.watch.rtc.time() + 5,
+            vibration_timeout)
+    wasp.watch.vibrator.pin(not cmd['n'])
+
+
+def _notify(cmd):
+    if filter_notifications(cmd):
+        id = cmd["id"]
+        del cmd["id"]
+        wasp.watch.vibrator.pulse(ms=wasp.system.notify_duration)
+        wasp.system.notify(id, cmd)
+
+
+def _unnotify(cmd):
+    wasp.system.unnotify(cmd['id'])
+
+
+def _call(cmd):
+    if cmd["cmd"] not in ["incoming", "outgoing"]:
+        raise Exception("Untested call notif")
+    name = cmd["name"] if "name" in cmd else ""
+    number = cmd["number"] if "number" in cmd else ""
+    rest = "/".join("%s:%s" % kv for kv in cmd.items()
+                    if kv[0] not in ("number", "name"))
+    wasp.system.notify("call", {
+        "title": "CALL",
+        "body": "{} at {}\n{}".format(name, number, rest),
+        })
+    if not wasp.system.notify_level <= 1:  # silent mode
+        wasp.system.wake()
+        wasp.system.switch(wasp.system.notifier)
+        pulse = wasp.watch.vibrator.pulse
+        sleep = time.sleep
+        duration = wasp.system.notify_duration
+        pulse(ms=duration)
+        sleep(0.3)
+        pulse(ms=duration)
+        sleep(0.3)
+        pulse(ms=duration)
+
+
+def _musicstate(cmd):
+    wasp.system.toggle_music(cmd)
+
+
+def _musicinfo(cmd):
+    wasp.system.set_music_info(cmd)
+
+
+def _weather(cmd):
+    wasp.system.set_weather_info(cmd)
+
+
+_HANDLERS = {
+    'find': _find,
+    'notify': _notify,
+    'notify-': _unnotify,
+    'call': _call,
+    'musicstate': _musicstate,
+    'musicinfo': _musicinfo,
+    'weather': _weather,
+}
+
+
 def GB(cmd):
     "execute code depending on what gadget bridge asks"
     task = cmd['t']
     del cmd['t']
 
     try:
-        if task == 'find':
-            wasp.system.set_alarm(
-                    wasp.watch.rtc.time() + 5,
-                    vibration_timeout)
-            wasp.watch.vibrator.pin(not cmd['n'])
-        elif task == 'notify':
-            if filter_notifications(cmd):
-                id = cmd["id"]
-                del cmd["id"]
-                wasp.watch.vibrator.pulse(ms=wasp.system.notify_duration)
-                wasp.system.notify(id, cmd)
-        elif task == 'notify-':
-            wasp.system.unnotify(cmd['id'])
-        elif task == 'call':
-            if cmd["cmd"] not in ["incoming", "outgoing"]:
-                raise Exception("Untested call notif")
-            name = cmd["name"] if "name" in cmd else ""
-            number = cmd["number"] if "number" in cmd else ""
-            rest = "/".join(["{}:{}".format(k, v)
-                             for k, v in cmd.items()
-                             if k not in ["number", "name"]])
-            del cmd
-            wasp.system.notify(task, {
-                "title": task.upper(),
-                "body": "{} at {}\n{}".format(name, number, rest),
-                })
-            if not wasp.system.notify_level <= 1:  # silent mode
-                import time
-                wasp.system.wake()
-                wasp.system.switch(wasp.system.notifier)
-                for i in range(3):
-                    wasp.watch.vibrator.pulse(ms=wasp.system.notify_duration)
-                    time.sleep(0.3)
-                del time
-        elif task == 'musicstate':
-            wasp.system.toggle_music(cmd)
-        elif task == 'musicinfo':
-            wasp.system.set_music_info(cmd)
-        elif task == 'weather':
-            wasp.system.set_weather_info(cmd)
+        handler = _HANDLERS.get(task)
+        if handler:
+            handler(cmd)
         else:
             error_to_notification(
                     title="GB_no_task",
                     msg='GadgetBridge task not implemented: "{}": "{}"'.format(
                         task,
-                        "/".join(["{}:{}".format(k, v)
-                                  for k, v in cmd.items()])
+                        "/".join("%s:%s" % kv for kv in cmd.items())
                         ))
     except Exception as e:
         msg = io.StringIO()
@@ -127,7 +153,7 @@ def GB(cmd):
                 msg="GB error: {} -  {}:{}".format(
                     e,
                     task,
-                    "/".join(["{}:{}".format(k, v) for k, v in cmd.items()])
+                    "/".join("%s:%s" % kv for kv in cmd.items())
                     ))
 
 
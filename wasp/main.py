@@ -13,15 +13,21 @@ try:
 except:
     pass
 
-try:
-    # load previous settings
-    wasp.system.notify_level = int(wasp.system.get("notify_level"))
-    wasp.system.brightness = int(wasp.system.get("brightness"))
-    wasp.system.hrm_freq = int(wasp.system.get("hrm_freq"))
-    wasp.system.battery_unit = wasp.system.get("battery_unit")
-    wasp.system.units = wasp.system.get("units")
-except:
-    pass
+# load previous settings, a corrupt value only loses that one setting
+nl, br, hf, bu, un = wasp.system.get_many(
+        ("notify_level", "brightness", "hrm_freq", "battery_unit", "units"),
+        (wasp.system.notify_level, wasp.system.brightness,
+         wasp.system.hrm_freq, wasp.system.battery_unit, wasp.system.units))
+for name, value in (("notify_level", nl), ("brightness", br),
+                    ("hrm_freq", hf)):
+    try:
+        setattr(wasp.system, name, int(value))
+    except:
+        pass
+wasp.system.battery_unit = bu
+wasp.system.units = un
+if wasp.system.hrm_freq > 0:
+    wasp.system.arm_heart_rate(60 * wasp.system.hrm_freq)
 
 # set notifification filter
 wasp.system._notif_filter = ["signal",
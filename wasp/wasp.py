@@ -117,6 +117,7 @@ class Manager():
         self.battery_unit = "mV"
         self.hrm_freq = 0
         self.latest_bpm = -1
+        self._hrm_armed = False
 
 
         self._theme = (
@@ -690,6 +691,43 @@ class Manager():
         except Exception:
             return None
 
+    def get_many(self, names, defaults):
+        """Retrieve the first stored item of several settings at once.
+
+        Each setting is still read from its own file. Listing the 'settings'
+        folder once up front only avoids trying to open the files of
+        settings that were never stored. Missing settings, and settings
+        whose first item is None, are replaced by the matching entry of
+        defaults. Returns a tuple.
+        """
+        try:
+            stored = os.listdir("settings")
+        except Exception:
+            stored = ()
+        values = []
+        for i in range(len(names)):
+            value = None
+            if names[i] in stored:
+                value = self.get(names[i])
+            if value and value[0] is not None:
+                values.append(value[0])
+            else:
+                values.append(defaults[i])
+        return tuple(values)
+
+    def arm_heart_rate(self, delay=60):
+        """Start the periodic heart rate reading unless it is already running.
+
+        The reading reschedules itself for as long as hrm_freq is non-zero
+        so it is only armed once, further calls are ignored until the
+        reading stops because hrm_freq was set to 0.
+
+        :param int delay: Seconds before the first reading is taken.
+        """
+        if not self._hrm_armed:
+            self._hrm_armed = True
+            self.set_alarm(watch.rtc.time() + delay, self._perdiodic_heart_rate)
+
     def _perdiodic_heart_rate(self):
         """
         compute heart rate periodically and store it as an attribute of self
@@ -702,6 +740,7 @@ class Manager():
             return
         if not self.hrm_freq > 0:
             # setting was disabled. Don't run and don't schedule next run
+            self._hrm_armed = False
             return
 
         try: